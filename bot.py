@@ -2,22 +2,72 @@ import discord
 from discord.ext import commands
 import asyncio
 import aiohttp
+import aiofiles
 import json
 import os
+import sys
+import time
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
-import xml.etree.ElementTree as ET
-from urllib.parse import urlencode, quote
+try:
+    from lxml import etree as ET
+    HAS_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAS_LXML = False
+from xml.parsers import expat
+try:
+    import orjson
+except ImportError:
+    orjson = None
+from urllib.parse import quote_plus
 import re
 import logging
 from pathlib import Path
+from collections import OrderedDict
 import hashlib
+import functools
 from dotenv import load_dotenv
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Unpaywall rejects requests without an email, used when NCBI_EMAIL is unset
+UNPAYWALL_FALLBACK_EMAIL = "research@example.com"
+
+# Connections per host, also the ceiling for adaptive download concurrency
+MAX_CONNECTIONS_PER_HOST = 8
+
+# How long cached search results stay valid
+SEARCH_CACHE_TTL = timedelta(hours=24)
+
+# Minimum seconds between progress edits of a Discord message
+PROGRESS_EDIT_INTERVAL = 2.0
+
+# Characters stripped from paper titles when building filenames
+_UNSAFE_FILENAME_RE = re.compile(r'[^\w\s-]')
+
+def _contact_email() -> Optional[str]:
+    """Operator contact address from NCBI_EMAIL, sent so services can reach us"""
+    return os.getenv("NCBI_EMAIL") or None
+
+def _encode_json(obj, indent: bool = False) -> bytes:
+    """Serialize obj to JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode()
+
+_decode_json = orjson.loads if orjson is not None else json.loads
+
+def _dump_json(obj, path: Path, indent: bool = True):
+    """Write obj to a JSON file"""
+    path.write_bytes(_encode_json(obj, indent))
+
+def _load_json(path: Path):
+    """Read a JSON file"""
+    return _decode_json(path.read_bytes())
+
 class ResearchBot(commands.Bot):
     def __init__(self):
         intents = discord.Intents.default()
@@ -32,11 +82,35 @@ class ResearchBot(commands.Bot):
         # Project storage
         self.base_dir = Path("research_projects")
         self.base_dir.mkdir(exist_ok=True)
+        
+        # Cached PubMed search results
+        self.cache_dir = self.base_dir / ".cache"
+        self.cache_dir.mkdir(exist_ok=True)
+        
+        # Searches currently running, keyed by PubMedSearcher.cache_key
+        self.inflight_searches: Dict[str, asyncio.Task] = {}
     
     async def on_ready(self):
         """Initialize HTTP session when bot starts"""
         if self.session is None:
-            self.session = aiohttp.ClientSession()
+            # Reuse keep-alive connections, most requests go to the same few hosts
+            connector = aiohttp.TCPConnector(
+                limit=64,
+                limit_per_host=MAX_CONNECTIONS_PER_HOST,
+                keepalive_timeout=75,
+                ttl_dns_cache=300,
+                enable_cleanup_closed=True
+            )
+            email = _contact_email()
+            user_agent = f"ResearchBot/1.0 (mailto:{email})" if email else "ResearchBot/1.0"
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                headers={
+                    'User-Agent': user_agent,
+                    'Accept-Encoding': 'gzip'
+                },
+                timeout=aiohttp.ClientTimeout(total=60)
+            )
         print(f'🤖 {self.user} has logged in to Discord!')
         print(f'📊 Bot is ready in {len(self.guilds)} guilds')
         
@@ -66,17 +140,237 @@ class ResearchBot(commands.Bot):
             await self.session.close()
         await super().close()
 
+class PubMedExpatParser:
+    """Incremental efetch XML parser that emits paper dicts without building a tree"""
+    
+    # Elements whose text content is collected
+    TEXT_FIELDS = {'ArticleTitle', 'AbstractText', 'ELocationID', 'PMID', 'Year',
+                   'DateRevised', 'LastName', 'ForeName'}
+    
+    # Paper keys filled from the first matching element in an article
+    FIELD_KEYS = {
+        'ArticleTitle': 'title',
+        'AbstractText': 'abstract',
+        'ELocationID': 'doi',
+        'PMID': 'pmid',
+        'Year': 'year',
+        'DateRevised': 'revised'
+    }
+    
+    # Papers already parsed, keyed by (PMID, DateRevised) and shared by all parsers
+    paper_cache: OrderedDict = OrderedDict()
+    PAPER_CACHE_SIZE = 10_000
+    
+    def __init__(self):
+        self.parser = expat.ParserCreate()
+        self.parser.buffer_text = True
+        self.parser.StartElementHandler = self._start_element
+        self.parser.EndElementHandler = self._end_element
+        self.parser.CharacterDataHandler = self._character_data
+        
+        self.stack = []
+        self.paper = None
+        self.author = None
+        # Stack depth of the element whose text is being collected
+        self.capture_depth = None
+        self.text = []
+        # Cached copy of the current paper, set once its PMID is known
+        self.cached_paper = None
+        self.finished = []
+    
+    def feed(self, data: bytes) -> List[Dict]:
+        """Parse a chunk and return the papers completed by it"""
+        self.parser.Parse(data, False)
+        return self._take_finished()
+    
+    def close(self) -> List[Dict]:
+        """Finish parsing and return any remaining papers"""
+        self.parser.Parse(b'', True)
+        return self._take_finished()
+    
+    def _take_finished(self) -> List[Dict]:
+        papers, self.finished = self.finished, []
+        return papers
+    
+    def _start_element(self, tag: str, attrs: Dict):
+        self.stack.append(tag)
+        
+        if tag == 'PubmedArticle':
+            self.paper = {key: None for key in self.FIELD_KEYS.values()}
+            self.paper['authors'] = []
+            return
+        
+        # Markup nested inside a field (e.g. <i> in a title) is part of its text
+        if self.paper is None or self.capture_depth is not None or self.cached_paper is not None:
+            return
+        
+        if tag == 'Article':
+            # PMID and DateRevised precede the article body, skip parsing a known paper
+            self.cached_paper = self._get_cached(self.paper)
+        elif tag == 'Author':
+            self.author = {}
+        elif tag in self.TEXT_FIELDS and self._wants_text(tag, attrs):
+            self.capture_depth = len(self.stack)
+            self.text = []
+    
+    def _wants_text(self, tag: str, attrs: Dict) -> bool:
+        """Whether the text of this element is still needed for the current paper"""
+        if tag in ('LastName', 'ForeName'):
+            return self.author is not None
+        if self.paper[self.FIELD_KEYS[tag]] is not None:
+            return False
+        if tag == 'ELocationID':
+            return attrs.get('EIdType') == 'doi'
+        if tag == 'Year':
+            return self.stack[-2] == 'PubDate'
+        return True
+    
+    def _character_data(self, data: str):
+        if self.capture_depth is not None:
+            self.text.append(data)
+    
+    def _end_element(self, tag: str):
+        depth = len(self.stack)
+        self.stack.pop()
+        
+        if self.cached_paper is not None:
+            if tag == 'PubmedArticle':
+                self.finished.append(self.cached_paper)
+                self.cached_paper = None
+                self.paper = None
+        elif self.capture_depth == depth:
+            self.capture_depth = None
+            text = ''.join(self.text) or None
+            if tag in ('LastName', 'ForeName'):
+                self.author[tag] = text
+            else:
+                self.paper[self.FIELD_KEYS[tag]] = text
+        elif tag == 'Author' and self.author is not None:
+            name = self.author.get('LastName')
+            if name is not None:
+                first_name = self.author.get('ForeName')
+                if first_name is not None:
+                    name = f"{first_name} {name}"
+                self.paper['authors'].append(name)
+            self.author = None
+        elif tag == 'PubmedArticle' and self.paper is not None:
+            paper_info = self._finish_paper(self.paper)
+            self._store_cached(self.paper, paper_info)
+            self.finished.append(paper_info)
+            self.paper = None
+    
+    @staticmethod
+    def _cache_key(paper: Dict) -> Optional[tuple]:
+        if paper['pmid'] is None:
+            return None
+        # DateRevised text is its Year/Month/Day children plus formatting whitespace
+        revised = ''.join((paper['revised'] or '').split())
+        return (paper['pmid'], revised)
+    
+    def _get_cached(self, paper: Dict) -> Optional[Dict]:
+        """Return a copy of a previously parsed paper, if any"""
+        key = self._cache_key(paper)
+        cached = self.paper_cache.get(key) if key else None
+        if cached is None:
+            return None
+        self.paper_cache.move_to_end(key)
+        return dict(cached, authors=list(cached['authors']))
+    
+    def _store_cached(self, paper: Dict, paper_info: Dict):
+        key = self._cache_key(paper)
+        if key is None:
+            return
+        self.paper_cache[key] = dict(paper_info, authors=list(paper_info['authors']))
+        self.paper_cache.move_to_end(key)
+        while len(self.paper_cache) > self.PAPER_CACHE_SIZE:
+            self.paper_cache.popitem(last=False)
+    
+    def _finish_paper(self, paper: Dict) -> Dict:
+        """Fill in defaults for fields missing from the article"""
+        pmid = paper['pmid']
+        return {
+            'title': paper['title'] or "No title",
+            'authors': paper['authors'],
+            'abstract': paper['abstract'] or "No abstract available",
+            'doi': paper['doi'],
+            'pmid': pmid,
+            'year': paper['year'] or "Unknown",
+            'pdf_url': f"https://www.ncbi.nlm.nih.gov/pmc/articles/PMC{pmid}/pdf/" if pmid else None
+        }
+
 class PubMedSearcher:
     """Handler for PubMed searches and paper fetching"""
     
     BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
     
-    def __init__(self, session: aiohttp.ClientSession):
+    # Query parameters that never change between requests, already encoded
+    SEARCH_URL = f"{BASE_URL}/esearch.fcgi?db=pubmed&retmode=xml&sort=relevance&tool=researchbot"
+    FETCH_URL = f"{BASE_URL}/efetch.fcgi?db=pubmed&retmode=xml&rettype=abstract&tool=researchbot"
+    
+    def __init__(self, session: aiohttp.ClientSession, cache_dir: Optional[Path] = None):
         self.session = session
+        self.cache_dir = cache_dir
+        
+        # NCBI asks for a real contact address, so it is only sent when configured
+        self.client_params = ""
+        email = _contact_email()
+        if email:
+            self.client_params += f"&email={quote_plus(email)}"
+        # An API key raises the NCBI rate limit from 3 to 10 requests per second
+        api_key = os.getenv("NCBI_API_KEY")
+        if api_key:
+            self.client_params += f"&api_key={quote_plus(api_key)}"
+    
+    @staticmethod
+    def cache_key(keywords: str, start_year: int = None, end_year: int = None,
+                  max_results: int = 10) -> str:
+        """Build a stable key identifying a search query"""
+        query = json.dumps([keywords, start_year, end_year, max_results], sort_keys=True)
+        return hashlib.blake2b(query.encode(), digest_size=16).hexdigest()
     
     async def search_papers(self, keywords: str, start_year: int = None, 
                           end_year: int = None, max_results: int = 10) -> List[Dict]:
-        """Search PubMed for papers matching criteria"""
+        """Search PubMed for papers matching criteria, using the cache when fresh"""
+        cache_file = None
+        if self.cache_dir is not None:
+            key = self.cache_key(keywords, start_year, end_year, max_results)
+            cache_file = self.cache_dir / f"{key}.json"
+            papers = self._read_cache(cache_file)
+            if papers is not None:
+                return papers
+        
+        papers = await self._search_uncached(keywords, start_year, end_year, max_results)
+        
+        if papers and cache_file is not None:
+            self._write_cache(cache_file, papers)
+        
+        return papers
+    
+    def _read_cache(self, cache_file: Path) -> Optional[List[Dict]]:
+        """Return cached papers if the cache file exists and is still fresh"""
+        try:
+            age = datetime.now().timestamp() - cache_file.stat().st_mtime
+            if age > SEARCH_CACHE_TTL.total_seconds():
+                return None
+            return _load_json(cache_file)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable search cache {cache_file.name}: {e}")
+            return None
+    
+    def _write_cache(self, cache_file: Path, papers: List[Dict]):
+        """Atomically store search results in the cache"""
+        try:
+            tmp_file = cache_file.with_suffix('.tmp')
+            _dump_json(papers, tmp_file, indent=False)
+            tmp_file.replace(cache_file)
+        except Exception as e:
+            logger.warning(f"Could not write search cache {cache_file.name}: {e}")
+    
+    async def _search_uncached(self, keywords: str, start_year: int = None,
+                               end_year: int = None, max_results: int = 10) -> List[Dict]:
+        """Query PubMed directly for papers matching criteria"""
         try:
             # Construct search query
             search_term = keywords
@@ -84,28 +378,21 @@ class PubMedSearcher:
                 search_term += f" AND {start_year}[PDAT]:{end_year}[PDAT]"
             
             # Search for PMIDs
-            search_params = {
-                'db': 'pubmed',
-                'term': search_term,
-                'retmax': max_results,
-                'retmode': 'xml',
-                'sort': 'relevance'
-            }
-            
-            search_url = f"{self.BASE_URL}/esearch.fcgi?" + urlencode(search_params)
+            search_url = f"{self.SEARCH_URL}{self.client_params}&retmax={int(max_results)}&term={quote_plus(search_term)}"
             
             async with self.session.get(search_url) as response:
                 if response.status != 200:
                     logger.error(f"Search failed: {response.status}")
                     return []
                 
-                xml_data = await response.text()
-                root = ET.fromstring(xml_data)
-                
-                # Extract PMIDs
+                # Extract PMIDs while the response streams in
+                parser = self._id_pull_parser()
                 pmids = []
-                for id_elem in root.findall('.//Id'):
-                    pmids.append(id_elem.text)
+                async for chunk in response.content.iter_any():
+                    parser.feed(chunk)
+                    self._collect_ids(parser, pmids)
+                parser.close()
+                self._collect_ids(parser, pmids)
                 
                 if not pmids:
                     return []
@@ -117,93 +404,96 @@ class PubMedSearcher:
             logger.error(f"Error searching PubMed: {e}")
             return []
     
+    @staticmethod
+    def _id_pull_parser():
+        """Create a pull parser reporting the end of each esearch <Id> element"""
+        if HAS_LXML:
+            # lxml filters by tag in C, other elements never reach Python
+            return ET.XMLPullParser(events=('end',), tag='Id', remove_blank_text=True)
+        return ET.XMLPullParser(events=('end',))
+    
+    @staticmethod
+    def _collect_ids(parser, pmids: List[str]):
+        """Move PMIDs from finished <Id> elements into pmids"""
+        for _, elem in parser.read_events():
+            if elem.tag == 'Id':
+                pmids.append(elem.text)
+                elem.clear()
+    
     async def _fetch_paper_details(self, pmids: List[str]) -> List[Dict]:
         """Fetch detailed paper information"""
         try:
-            fetch_params = {
-                'db': 'pubmed',
-                'id': ','.join(pmids),
-                'retmode': 'xml',
-                'rettype': 'abstract'
-            }
-            
-            fetch_url = f"{self.BASE_URL}/efetch.fcgi?" + urlencode(fetch_params)
+            fetch_url = f"{self.FETCH_URL}{self.client_params}&id={quote_plus(','.join(pmids))}"
             
             async with self.session.get(fetch_url) as response:
-                xml_data = await response.text()
-                root = ET.fromstring(xml_data)
+                # Parse chunks as they arrive, no element tree is ever built
+                parser = PubMedExpatParser()
                 
                 papers = []
-                for article in root.findall('.//PubmedArticle'):
-                    paper_info = self._extract_paper_info(article)
-                    if paper_info:
-                        papers.append(paper_info)
+                async for chunk in response.content.iter_any():
+                    papers.extend(parser.feed(chunk))
+                papers.extend(parser.close())
                 
                 return papers
                 
         except Exception as e:
             logger.error(f"Error fetching paper details: {e}")
             return []
-    
-    def _extract_paper_info(self, article) -> Optional[Dict]:
-        """Extract paper information from XML"""
-        try:
-            # Basic info
-            title_elem = article.find('.//ArticleTitle')
-            title = title_elem.text if title_elem is not None else "No title"
-            
-            # Authors
-            authors = []
-            for author in article.findall('.//Author'):
-                last_name = author.find('LastName')
-                first_name = author.find('ForeName')
-                if last_name is not None:
-                    name = last_name.text
-                    if first_name is not None:
-                        name = f"{first_name.text} {name}"
-                    authors.append(name)
-            
-            # Abstract
-            abstract_elem = article.find('.//AbstractText')
-            abstract = abstract_elem.text if abstract_elem is not None else "No abstract available"
-            
-            # DOI
-            doi_elem = article.find('.//ELocationID[@EIdType="doi"]')
-            doi = doi_elem.text if doi_elem is not None else None
-            
-            # PMID
-            pmid_elem = article.find('.//PMID')
-            pmid = pmid_elem.text if pmid_elem is not None else None
-            
-            # Publication year
-            year_elem = article.find('.//PubDate/Year')
-            year = year_elem.text if year_elem is not None else "Unknown"
-            
-            return {
-                'title': title,
-                'authors': authors,
-                'abstract': abstract,
-                'doi': doi,
-                'pmid': pmid,
-                'year': year,
-                'pdf_url': f"https://www.ncbi.nlm.nih.gov/pmc/articles/PMC{pmid}/pdf/" if pmid else None
-            }
-            
-        except Exception as e:
-            logger.error(f"Error extracting paper info: {e}")
-            return None
 
 class ProjectManager:
     """Manages research project folders and metadata"""
     
     def __init__(self, base_dir: Path):
         self.base_dir = base_dir
+        # Append-only log of project metadata, saves opening every metadata.json
+        self.index_file = base_dir / "projects_index.jsonl"
+        if not self.index_file.exists():
+            self._rebuild_index()
+    
+    def _rebuild_index(self):
+        """Build the index from the metadata files of existing projects"""
+        lines = []
+        for project_dir in self.base_dir.iterdir():
+            metadata_file = project_dir / "metadata.json"
+            if project_dir.is_dir() and metadata_file.exists():
+                metadata = _load_json(metadata_file)
+                metadata['project_id'] = project_dir.name
+                lines.append(_encode_json(metadata) + b"\n")
+        
+        with open(self.index_file, 'wb') as f:
+            f.writelines(lines)
+    
+    def _append_index(self, entry: Dict):
+        """Record a new project or a metadata change in the index"""
+        line = _encode_json(entry) + b"\n"
+        with open(self.index_file, 'ab+') as f:
+            # Start on a fresh line if an interrupted append left a partial one,
+            # otherwise this entry would be glued onto it and lost too
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    line = b"\n" + line
+            f.write(line)
+    
+    def list_projects(self) -> List[tuple]:
+        """Return (project_name, metadata) pairs, newest first"""
+        projects = {}
+        with open(self.index_file, 'rb') as f:
+            for line in f:
+                try:
+                    entry = _decode_json(line)
+                except json.JSONDecodeError:
+                    # Skip a line left half-written by an interrupted append
+                    continue
+                projects.setdefault(entry['project_id'], {}).update(entry)
+        
+        return sorted(projects.items(), key=lambda item: item[1].get('created_at', ''), reverse=True)
     
     def create_project(self, query: str, user_id: str) -> Path:
         """Create a new project folder"""
         # Generate project ID from query and timestamp
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        query_hash = hashlib.md5(query.encode()).hexdigest()[:8]
+        query_hash = hashlib.blake2b(query.encode(), digest_size=4).hexdigest()
         project_name = f"project_{timestamp}_{query_hash}"
         
         project_dir = self.base_dir / project_name
@@ -225,8 +515,8 @@ class ProjectManager:
             'status': 'created'
         }
         
-        with open(project_dir / "metadata.json", 'w') as f:
-            json.dump(metadata, f, indent=2)
+        _dump_json(metadata, project_dir / "metadata.json")
+        self._append_index(metadata)
         
         return project_dir
     
@@ -235,16 +525,96 @@ class ProjectManager:
         metadata_file = project_dir / "metadata.json"
         
         if metadata_file.exists():
-            with open(metadata_file, 'r') as f:
-                metadata = json.load(f)
+            metadata = _load_json(metadata_file)
         else:
             metadata = {}
         
         metadata.update(updates)
         metadata['updated_at'] = datetime.now().isoformat()
         
-        with open(metadata_file, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        _dump_json(metadata, metadata_file)
+        # Store the full merged metadata so the line stands on its own, even
+        # for a project whose earlier index lines are missing
+        self._append_index({**metadata, 'project_id': project_dir.name})
+
+class ServiceOverloadError(Exception):
+    """Raised when a remote service asks us to back off (HTTP 429/503)"""
+
+class AdaptiveLimiter:
+    """Concurrency limiter using additive-increase/multiplicative-decrease"""
+    
+    def __init__(self, initial_concurrency: int = 8, min_concurrency: int = 1,
+                 max_concurrency: int = 16, increase_step: float = 0.1,
+                 decrease_factor: float = 0.5):
+        self.limit = float(initial_concurrency)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.active = 0
+        # Bumped on every decrease, overloads from requests started before it are ignored
+        self.generation = 0
+        # Created lazily so it binds to the running event loop
+        self._condition = None
+    
+    def _get_condition(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+    
+    async def _acquire(self) -> int:
+        """Wait for a free slot and return the generation it was taken in"""
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.active < int(self.limit))
+            self.active += 1
+            return self.generation
+    
+    async def _release(self, generation: int, overloaded: bool = False, succeeded: bool = False):
+        condition = self._get_condition()
+        async with condition:
+            self.active -= 1
+            if overloaded:
+                # One throttling burst hits every request in flight, only the
+                # first overload of a generation lowers the limit
+                if generation == self.generation:
+                    self.generation += 1
+                    self.limit = max(self.min_concurrency, self.limit * self.decrease_factor)
+                    logger.info(f"Service overloaded, concurrency lowered to {int(self.limit)}")
+            elif succeeded:
+                self.limit = min(self.max_concurrency, self.limit + self.increase_step)
+            condition.notify_all()
+    
+    async def run(self, func, *args, max_retries: int = 3, **kwargs):
+        """Run a coroutine function under the limiter, retrying on overload"""
+        for attempt in range(max_retries + 1):
+            generation = await self._acquire()
+            try:
+                result = await func(*args, **kwargs)
+            except ServiceOverloadError:
+                await self._release(generation, overloaded=True)
+                if attempt == max_retries:
+                    raise
+                await asyncio.sleep(2 ** attempt)
+                continue
+            except BaseException:
+                await self._release(generation)
+                raise
+            await self._release(generation, succeeded=True)
+            return result
+
+def with_adaptive_retry(**limiter_kwargs):
+    """Decorator sharing one AdaptiveLimiter across all calls of a coroutine function"""
+    limiter = AdaptiveLimiter(**limiter_kwargs)
+    
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await limiter.run(func, *args, **kwargs)
+        wrapper.limiter = limiter
+        return wrapper
+    
+    return decorator
 
 # Initialize bot
 bot = ResearchBot()
@@ -315,9 +685,19 @@ async def search_papers(ctx, *, args: str):
         project_manager = ProjectManager(bot.base_dir)
         project_dir = project_manager.create_project(keywords_str, str(ctx.author.id))
         
-        # Search papers
-        searcher = PubMedSearcher(bot.session)
-        papers = await searcher.search_papers(keywords_str, start_year, end_year, max_results)
+        # Search papers, joining an identical search that is already running
+        search_key = PubMedSearcher.cache_key(keywords_str, start_year, end_year, max_results)
+        search = bot.inflight_searches.get(search_key)
+        if search is None:
+            searcher = PubMedSearcher(bot.session, bot.cache_dir)
+            search = asyncio.create_task(
+                searcher.search_papers(keywords_str, start_year, end_year, max_results)
+            )
+            bot.inflight_searches[search_key] = search
+            search.add_done_callback(lambda _: bot.inflight_searches.pop(search_key, None))
+        
+        # Shield the shared task so one cancelled command doesn't cancel it for the others
+        papers = await asyncio.shield(search)
         
         if not papers:
             embed = discord.Embed(
@@ -335,8 +715,7 @@ async def search_papers(ctx, *, args: str):
         })
         
         # Save papers to JSON
-        with open(project_dir / "papers_metadata.json", 'w') as f:
-            json.dump(papers, f, indent=2)
+        _dump_json(papers, project_dir / "papers_metadata.json")
         
         # Create summary embed
         embed = discord.Embed(
@@ -397,8 +776,7 @@ async def download_papers(ctx, project_name: str):
         return
     
     # Load papers
-    with open(papers_file, 'r') as f:
-        papers = json.load(f)
+    papers = _load_json(papers_file)
     
     embed = discord.Embed(
         title="📥 Downloading Papers",
@@ -409,21 +787,31 @@ async def download_papers(ctx, project_name: str):
     
     downloaded = 0
     failed = 0
-    
+
+    async def download_one(paper: Dict) -> bool:
+        if not paper.get('doi'):
+            return False
+        try:
+            # Try to download via various sources
+            return await _try_download_paper(bot.session, paper, project_dir / "papers")
+        except Exception as e:
+            logger.debug(f"Download failed for {paper.get('pmid')}: {e}")
+            return False
+
     try:
-        for i, paper in enumerate(papers):
-            if paper.get('doi'):
-                # Try to download via various sources
-                success = await _try_download_paper(bot.session, paper, project_dir / "papers")
-                if success:
-                    downloaded += 1
-                else:
-                    failed += 1
+        last_edit = time.monotonic()
+        tasks = [download_one(paper) for paper in papers]
+        for i, next_done in enumerate(asyncio.as_completed(tasks)):
+            if await next_done:
+                downloaded += 1
             else:
                 failed += 1
-            
-            # Update progress every 5 papers
-            if (i + 1) % 5 == 0 or i == len(papers) - 1:
+
+            # Throttle progress edits to stay clear of Discord's edit rate limit,
+            # the final state is shown by the completion embed below
+            now = time.monotonic()
+            if now - last_edit >= PROGRESS_EDIT_INTERVAL and i < len(papers) - 1:
+                last_edit = now
                 embed = discord.Embed(
                     title="📥 Downloading Papers",
                     description=f"Progress: {i+1}/{len(papers)}\n✅ Downloaded: {downloaded}\n❌ Failed: {failed}",
@@ -461,7 +849,7 @@ async def _try_download_paper(session: aiohttp.ClientSession, paper: Dict, downl
     download_dir.mkdir(exist_ok=True)
     
     # Generate filename
-    safe_title = re.sub(r'[^\w\s-]', '', paper['title'])[:50]
+    safe_title = _UNSAFE_FILENAME_RE.sub('', paper['title'])[:50]
     filename = f"{paper['pmid'] or 'unknown'}_{safe_title}.pdf"
     filepath = download_dir / filename
     
@@ -474,23 +862,35 @@ async def _try_download_paper(session: aiohttp.ClientSession, paper: Dict, downl
     
     if paper.get('doi'):
         # Try Unpaywall (free access)
-        urls_to_try.append(f"https://api.unpaywall.org/v2/{paper['doi']}?email=research@example.com")
+        urls_to_try.append(f"https://api.unpaywall.org/v2/{paper['doi']}?email={quote_plus(_contact_email() or UNPAYWALL_FALLBACK_EMAIL)}")
     
     if paper.get('pmid'):
         # Try PMC
         urls_to_try.append(f"https://www.ncbi.nlm.nih.gov/pmc/articles/PMC{paper['pmid']}/pdf/")
     
+    if not urls_to_try:
+        return False
+    
+    return await _fetch_paper_pdf(session, urls_to_try, filepath)
+
+# Concurrency across all downloads adapts to how hard the servers push back.
+# Only calls that hit the network go through the limiter, so skipped papers
+# don't count as successes.
+@with_adaptive_retry(initial_concurrency=MAX_CONNECTIONS_PER_HOST, min_concurrency=1,
+                     max_concurrency=MAX_CONNECTIONS_PER_HOST)
+async def _fetch_paper_pdf(session: aiohttp.ClientSession, urls_to_try: List[str], filepath: Path) -> bool:
+    """Try each source URL in turn until a PDF is saved"""
     for url in urls_to_try:
         try:
             async with session.get(url, timeout=30) as response:
+                if response.status in (429, 503):
+                    raise ServiceOverloadError(f"{url} returned {response.status}")
                 if response.status == 200:
                     content_type = response.headers.get('content-type', '')
                     
                     if 'application/pdf' in content_type:
                         # Direct PDF download
-                        with open(filepath, 'wb') as f:
-                            async for chunk in response.content.iter_chunked(8192):
-                                f.write(chunk)
+                        await _save_response(response, filepath)
                         return True
                     elif 'application/json' in content_type:
                         # Unpaywall API response
@@ -499,6 +899,8 @@ async def _try_download_paper(session: aiohttp.ClientSession, paper: Dict, downl
                             pdf_url = data['best_oa_location'].get('url_for_pdf')
                             if pdf_url:
                                 return await _download_pdf_direct(session, pdf_url, filepath)
+        except ServiceOverloadError:
+            raise
         except Exception as e:
             logger.debug(f"Failed to download from {url}: {e}")
             continue
@@ -509,28 +911,36 @@ async def _download_pdf_direct(session: aiohttp.ClientSession, url: str, filepat
     """Download PDF directly from URL"""
     try:
         async with session.get(url, timeout=30) as response:
+            if response.status in (429, 503):
+                raise ServiceOverloadError(f"{url} returned {response.status}")
             if response.status == 200:
-                with open(filepath, 'wb') as f:
-                    async for chunk in response.content.iter_chunked(8192):
-                        f.write(chunk)
+                await _save_response(response, filepath)
                 return True
+    except ServiceOverloadError:
+        raise
     except Exception as e:
         logger.debug(f"Failed direct PDF download: {e}")
     
     return False
 
+async def _save_response(response: aiohttp.ClientResponse, filepath: Path):
+    """Stream a response body to disk without blocking the event loop"""
+    # Write to a temporary file first so a failed download never leaves a partial PDF
+    tmp_path = filepath.with_suffix('.part')
+    try:
+        async with aiofiles.open(tmp_path, 'wb') as f:
+            async for chunk in response.content.iter_chunked(65536):
+                await f.write(chunk)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
 @bot.command(name='projects', help='List all projects')
 async def list_projects(ctx):
     """List all research projects"""
     
-    projects = []
-    for project_dir in bot.base_dir.iterdir():
-        if project_dir.is_dir():
-            metadata_file = project_dir / "metadata.json"
-            if metadata_file.exists():
-                with open(metadata_file, 'r') as f:
-                    metadata = json.load(f)
-                projects.append((project_dir.name, metadata))
+    projects = ProjectManager(bot.base_dir).list_projects()
     
     if not projects:
         await ctx.send("📁 No projects found")
@@ -542,8 +952,9 @@ async def list_projects(ctx):
         color=0x3498db
     )
     
-    for project_name, metadata in projects[-10:]:  # Show last 10
-        created_at = datetime.fromisoformat(metadata['created_at']).strftime("%Y-%m-%d %H:%M")
+    for project_name, metadata in projects[:10]:  # Show latest 10
+        created_at = metadata.get('created_at')
+        created_at = datetime.fromisoformat(created_at).strftime("%Y-%m-%d %H:%M") if created_at else "Unknown"
         embed.add_field(
             name=f"📂 {project_name}",
             value=f"**Query:** {metadata.get('query', 'N/A')}\n**Created:** {created_at}\n**Papers:** {metadata.get('papers_found', 0)} found, {metadata.get('papers_downloaded', 0)} downloaded\n**Status:** {metadata.get('status', 'unknown')}",
@@ -607,12 +1018,19 @@ async def on_command_error(ctx, error):
 load_dotenv()
 
 if __name__ == "__main__":
-    # Replace with your bot token
-    TOKEN = os.getenv("TOKEN")
+    # libuv-backed event loop where available (not on Windows)
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
+    # Token comes from the environment (or .env), never from source
+    TOKEN = os.environ.get("DISCORD_TOKEN")
     
-    if TOKEN == "YOUR_DISCORD_BOT_TOKEN_HERE":
-        print("❌ Please set your Discord bot token in the TOKEN variable")
-        exit(1)
+    if not TOKEN:
+        print("❌ Please set the DISCORD_TOKEN environment variable (or add it to .env)")
+        sys.exit(1)
     
     try:
         bot.run(TOKEN)
@@ -1,6 +1,9 @@
 import discord
 from discord.ext import commands
 import asyncio
+import os
+import sys
+from dotenv import load_dotenv
 
 # Simple test bot to debug connection issues
 class TestBot(commands.Bot):
@@ -83,12 +86,13 @@ async def on_command_error(ctx, error):
         await ctx.send(f"❌ Error: {str(error)}")
 
 if __name__ == "__main__":
-    TOKEN = "YOUR_DISCORD_BOT_TOKEN_HERE"
+    load_dotenv()
+    TOKEN = os.environ.get("DISCORD_TOKEN")
     
-    if TOKEN == "YOUR_DISCORD_BOT_TOKEN_HERE":
+    if not TOKEN:
         print("❌ Please set your Discord bot token!")
-        print("Replace TOKEN = 'YOUR_DISCORD_BOT_TOKEN_HERE' with your actual token")
-        exit(1)
+        print("Set the DISCORD_TOKEN environment variable or add it to .env")
+        sys.exit(1)
     
     print("🚀 Starting test bot...")
     try: